@@ -1,5 +1,8 @@
-from utils.file_handler import read_sales_data
-from utils.data_processor import parse_transactions, validate_and_filter
+import argparse
+
+from utils.file_handler import SALES_ENCODINGS, detect_compression, iter_sales_lines, read_sales_data
+from utils.data_processor import apply_filters, iter_valid_transactions, parse_transactions, validate_and_filter
+from utils.dedup import create_duplicate_checker
 
 from utils.analytics import (
     calculate_total_revenue,
@@ -11,24 +14,301 @@ from utils.analytics import (
     low_performing_products
 )
 
-from utils.api_handler import fetch_all_products, create_product_mapping, enrich_sales_data
-from utils.report_generator import generate_sales_report
+from utils.api_handler import fetch_all_products, create_product_mapping, enrich_sales_data, enrich_sales_stream
+from utils.report_generator import generate_fan_out_reports, generate_sales_report
+from utils.fan_out import GLOBAL_SINK, fan_out_aggregates, parse_amount_band
+from utils.live_tail import follow_sales_file
+from utils.sqlite_backend import (
+    DEFAULT_DB_PATH,
+    connect_sales_db,
+    filter_options_sql,
+    is_source_loaded,
+    iter_transactions_sql,
+    load_summary,
+    load_transactions,
+    source_fingerprint
+)
+
+
+def amount_band_arg(text):
+    try:
+        return parse_amount_band(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Sales Analytics System")
+    parser.add_argument(
+        "--input", default="data/sales_data.txt",
+        help="sales data file; .gz/.bz2/.xz/.zst are decompressed while reading (default: data/sales_data.txt)"
+    )
+    parser.add_argument(
+        "--backend", choices=["memory", "sqlite"], default="memory",
+        help="where analytics run: in memory (default) or in a SQLite database"
+    )
+    parser.add_argument(
+        "--db", default=DEFAULT_DB_PATH,
+        help=f"SQLite database path for --backend sqlite (default: {DEFAULT_DB_PATH})"
+    )
+    parser.add_argument(
+        "--memory-limit-mb", type=float, default=None,
+        help="RAM ceiling for customer/product grouping; spills to disk above it"
+    )
+    parser.add_argument(
+        "--follow", action="store_true",
+        help="live tail mode: keep the report updated as lines are appended to the sales file"
+    )
+    parser.add_argument(
+        "--interval", type=float, default=5.0,
+        help="seconds between report rewrites in --follow mode (default: 5)"
+    )
+    parser.add_argument(
+        "--expected-rows", type=int, default=None,
+        help="expected number of transactions for --follow or --backend sqlite; above 5 million, duplicate "
+             "detection uses a Bloom filter plus an on-disk store instead of an in-memory set"
+    )
+    parser.add_argument(
+        "--fan-out", action="store_true",
+        help="one pass over the data renders the global report plus one report per region"
+    )
+    parser.add_argument(
+        "--amount-band", action="append", default=[], metavar="MIN:MAX", type=amount_band_arg,
+        help="extra --fan-out report for an amount band, e.g. 1000:50000 or :5000 (repeatable)"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None,
+        help="worker processes for parallel decompression of multi-member archives and --fan-out rendering"
+    )
+    args = parser.parse_args(argv)
+
+    if args.memory_limit_mb is not None and (args.backend == "sqlite" or args.fan_out or args.follow):
+        parser.error("--memory-limit-mb only applies to the default in-memory report "
+                     "(not with --backend sqlite, --fan-out or --follow)")
+
+    if args.fan_out and (args.backend == "sqlite" or args.follow):
+        parser.error("--fan-out cannot be combined with --backend sqlite or --follow")
+
+    if args.amount_band and not args.fan_out:
+        parser.error("--amount-band only applies to --fan-out")
+
+    if args.expected_rows is not None and not (args.follow or args.backend == "sqlite"):
+        parser.error("--expected-rows only applies to --follow and --backend sqlite")
+
+    return args
+
+
+def print_filter_options(available_regions, min_amount, max_amount):
+    print("Regions:", ", ".join(available_regions))
+    if min_amount is not None:
+        print(f"Amount Range: ₹{min_amount:,.0f} - ₹{max_amount:,.0f}")
+    else:
+        print("Amount Range: ₹0 - ₹0")
+
+
+def prompt_filters():
+    """
+    Asks the user for optional region/amount filters
+    Returns: tuple (region, min_amount, max_amount), each may be None
+    """
+
+    user_choice = input("\nDo you want to filter data? (y/n): ").strip().lower()
+
+    region_filter = None
+    min_amount_filter = None
+    max_amount_filter = None
+
+    if user_choice == "y":
+        region_filter = input("Enter region (or leave blank for all): ").strip()
+        if region_filter == "":
+            region_filter = None
+
+        min_val = input("Enter minimum amount (or leave blank): ").strip()
+        max_val = input("Enter maximum amount (or leave blank): ").strip()
+
+        if min_val != "":
+            min_amount_filter = float(min_val)
+
+        if max_val != "":
+            max_amount_filter = float(max_val)
+
+        print("\nApplying filters...\n")
+    else:
+        print("\nNo filters applied.\n")
+
+    return region_filter, min_amount_filter, max_amount_filter
+
+
+def load_sqlite(args, db_conn):
+    """
+    Streams the input file into the database batch by batch
+    (read -> parse -> validate -> executemany), so it never has to fit in memory
+
+    Returns: number of transactions loaded, or None if the file is missing
+    """
+
+    # Fingerprint before reading, so a file changed mid-read is reloaded next time
+    fingerprint = source_fingerprint(args.input)
+    if fingerprint is None:
+        print(f"Error: File '{args.input}' not found.")
+        return None
+
+    compression = detect_compression(args.input)
+
+    for enc in SALES_ENCODINGS:
+        summary = {"total_input": 0, "invalid": 0, "duplicates": 0}
+        seen_ids = create_duplicate_checker(args.expected_rows or 0)
+        try:
+            valid_transactions = iter_valid_transactions(
+                iter_sales_lines(args.input, enc, compression), seen_ids, summary
+            )
+            return load_transactions(db_conn, valid_transactions, fingerprint=fingerprint, summary=summary)
+        except UnicodeDecodeError:
+            # The load was rolled back; read the whole file again with the next encoding
+            continue
+        finally:
+            seen_ids.close()
+
+    return 0
+
+
+def run_sqlite(args):
+    """
+    SQLite backend: loads the input (unless this exact file version is
+    already loaded), then every metric and the enrichment come from the
+    database, so a re-run on the unchanged file gives the same report
+    """
+
+    db_conn = connect_sales_db(args.db)
+
+    try:
+        if is_source_loaded(db_conn, args.input):
+            print(f"[1/5] Using {args.db} (already loaded from {args.input}, file unchanged)\n")
+        else:
+            print(f"[1/5] Loading sales data into {args.db}...")
+            loaded = load_sqlite(args, db_conn)
+            if loaded is None:
+                return
+            print(f"✓ Loaded {loaded} transactions\n")
+
+        filter_summary = load_summary(db_conn)
+        print(
+            f"✓ Valid: {filter_summary['total_input'] - filter_summary['invalid'] - filter_summary['duplicates']} | "
+            f"Invalid: {filter_summary['invalid']} | Duplicates: {filter_summary['duplicates']}\n"
+        )
+
+        print("[2/5] Filter Options Available:")
+        print_filter_options(*filter_options_sql(db_conn))
+        region_filter, min_amount_filter, max_amount_filter = prompt_filters()
+        db_filters = {"region": region_filter, "min_amount": min_amount_filter, "max_amount": max_amount_filter}
+
+        print("[3/5] Fetching product data from API...")
+        product_mapping = create_product_mapping(fetch_all_products())
+        print()
+
+        print("[4/5] Enriching sales data...")
+        enrichment = enrich_sales_stream(iter_transactions_sql(db_conn, **db_filters), product_mapping)
+        print(f"✓ Enriched {enrichment['enriched']}/{enrichment['total']} transactions\n")
+
+        print("[5/5] Generating report...")
+        generate_sales_report(
+            None,
+            None,
+            output_file="output/sales_report.txt",
+            filter_summary=filter_summary,
+            db_conn=db_conn,
+            db_filters=db_filters,
+            enrichment_summary=enrichment
+        )
+        print("✓ Report saved to: output/sales_report.txt\n")
 
+    finally:
+        db_conn.close()
+
+
+def run_fan_out(args):
+    """
+    Fan-out mode: one read/parse/validate/aggregate pass, N report renders
+    """
 
-def main():
+    print("[1/5] Reading and parsing sales data...")
+    transactions = parse_transactions(read_sales_data(args.input, workers=args.workers))
+    valid_transactions, invalid_count, filter_summary = validate_and_filter(transactions, verbose=False)
+    print(
+        f"✓ Valid: {len(valid_transactions)} | Invalid: {invalid_count} | "
+        f"Duplicates: {filter_summary['duplicates']}\n"
+    )
+
+    print("[2/5] Aggregating into report sinks (single pass)...")
+    sinks = fan_out_aggregates(valid_transactions, amount_bands=args.amount_band)
+    print(f"✓ {len(sinks)} sinks: {', '.join(sinks)}\n")
+
+    print("[3/5] Fetching product data from API...")
+    product_mapping = create_product_mapping(fetch_all_products())
+    print()
+
+    print("[4/5] Enriching sales data...")
+    enriched_transactions = enrich_sales_data(valid_transactions, product_mapping)
+    print()
+
+    print("[5/5] Generating reports...")
+    report_stats = {name: sink.report_stats() for name, sink in sinks.items()}
+    generate_fan_out_reports(
+        report_stats,
+        enriched_transactions,
+        output_dir="output",
+        filter_summary=filter_summary,
+        workers=args.workers,
+        global_name=GLOBAL_SINK
+    )
+    print(f"✓ {len(report_stats)} reports saved to: output/\n")
+
+
+def main(argv=None):
     """
     Main execution function (Task 5.1)
     """
 
+    args = parse_args(argv)
+
+    if args.follow:
+        try:
+            try:
+                compression = detect_compression(args.input)
+            except FileNotFoundError:
+                # Not created yet: the tail waits for it like any other plain file
+                compression = None
+            if compression:
+                print("Error: --follow needs a plain text file (compressed files cannot be appended to).")
+                return
+            follow_sales_file(args.input, output_file="output/sales_report.txt", interval=args.interval,
+                              expected_rows=args.expected_rows)
+        except Exception as e:
+            print("\n❌ Something went wrong.")
+            print("Error:", str(e))
+        return
+
+    if args.fan_out:
+        try:
+            run_fan_out(args)
+        except Exception as e:
+            print("\n❌ Something went wrong.")
+            print("Error:", str(e))
+        return
+
     try:
         print("=" * 40)
         print("SALES ANALYTICS SYSTEM")
         print("=" * 40)
         print()
 
+        if args.backend == "sqlite":
+            run_sqlite(args)
+            return
+
         # [1/10] Reading data
         print("[1/10] Reading sales data...")
-        raw_lines = read_sales_data("data/sales_data.txt")
+        raw_lines = read_sales_data(args.input, workers=args.workers)
         print(f"✓ Successfully read {len(raw_lines)} transactions\n")
 
         # [2/10] Parsing data
@@ -45,53 +325,34 @@ def main():
         available_regions = sorted(list(set([t["Region"] for t in valid_preview])))
         amounts = [t["Amount"] for t in valid_preview] if valid_preview else []
 
-        print("Regions:", ", ".join(available_regions))
-        if amounts:
-            print(f"Amount Range: ₹{min(amounts):,.0f} - ₹{max(amounts):,.0f}")
-        else:
-            print("Amount Range: ₹0 - ₹0")
-
-        user_choice = input("\nDo you want to filter data? (y/n): ").strip().lower()
-
-        region_filter = None
-        min_amount_filter = None
-        max_amount_filter = None
-
-        if user_choice == "y":
-            region_filter = input("Enter region (or leave blank for all): ").strip()
-            if region_filter == "":
-                region_filter = None
+        print_filter_options(available_regions, min(amounts) if amounts else None, max(amounts) if amounts else None)
+        region_filter, min_amount_filter, max_amount_filter = prompt_filters()
 
-            min_val = input("Enter minimum amount (or leave blank): ").strip()
-            max_val = input("Enter maximum amount (or leave blank): ").strip()
-
-            if min_val != "":
-                min_amount_filter = float(min_val)
-
-            if max_val != "":
-                max_amount_filter = float(max_val)
-
-            print("\nApplying filters...\n")
-        else:
-            print("\nNo filters applied.\n")
-
-        # [4/10] Validating and filtering
+        # [4/10] Validating and filtering (rows were validated for the preview; only filter here)
         print("[4/10] Validating transactions...")
-        valid_transactions, invalid_count, filter_summary = validate_and_filter(
-            transactions,
+        valid_transactions, filter_summary = apply_filters(
+            valid_preview,
             region=region_filter,
             min_amount=min_amount_filter,
-            max_amount=max_amount_filter
+            max_amount=max_amount_filter,
+            summary=summary_preview
+        )
+        invalid_count = invalid_preview
+        print(
+            f"✓ Valid: {len(valid_transactions)} | Invalid: {invalid_count} | "
+            f"Duplicates: {filter_summary['duplicates']}\n"
         )
-        print(f"✓ Valid: {len(valid_transactions)} | Invalid: {invalid_count}\n")
 
         # [5/10] Analytics
         print("[5/10] Analyzing sales data...")
 
         total_rev = calculate_total_revenue(valid_transactions)
         region_stats = region_wise_sales(valid_transactions)
-        top_products = top_selling_products(valid_transactions, n=5)
-        customer_stats = customer_analysis(valid_transactions)
+        # With --memory-limit-mb, customer/product grouping runs once
+        # (spilling to disk) inside generate_sales_report instead
+        if args.memory_limit_mb is None:
+            top_products = top_selling_products(valid_transactions, n=5)
+            customer_stats = customer_analysis(valid_transactions)
         daily_trend = daily_sales_trend(valid_transactions)
         peak_day = find_peak_sales_day(valid_transactions)
         low_products = low_performing_products(valid_transactions, threshold=10)
@@ -121,7 +382,13 @@ def main():
 
         # [9/10] Generate report
         print("[9/10] Generating report...")
-        generate_sales_report(valid_transactions, enriched_transactions, output_file="output/sales_report.txt")
+        generate_sales_report(
+            valid_transactions,
+            enriched_transactions,
+            output_file="output/sales_report.txt",
+            filter_summary=filter_summary,
+            memory_limit_mb=args.memory_limit_mb
+        )
         print("✓ Report saved to: output/sales_report.txt\n")
 
         # [10/10] Done
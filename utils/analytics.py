@@ -1,5 +1,7 @@
 # utils/analytics.py
 
+import heapq
+
 
 def calculate_total_revenue(transactions):
     total_revenue = 0.0
@@ -164,3 +166,186 @@ def low_performing_products(transactions, threshold=10):
     low_products.sort(key=lambda x: x[1])
 
     return low_products
+
+
+class RunningAggregates:
+    """
+    Incrementally updated report metrics
+
+    add() costs O(1) per transaction; report_stats() returns the same dict
+    shape as report_generator.build_report_stats, with the same ordering
+    rules as utils/analytics.py
+
+    Validated rows have Quantity > 0 and UnitPrice > 0, so every running
+    total only grows. report_stats() therefore only re-ranks the previous
+    top-N / low performers / peak day together with the keys changed since
+    the last call, instead of rescanning every customer, product and day.
+    """
+
+    def __init__(self, top_n=5, low_threshold=10):
+        self.top_n = top_n
+        self.low_threshold = low_threshold
+
+        self.total_revenue = 0.0
+        self.transaction_count = 0
+        self.min_date = None
+        self.max_date = None
+        self.regions = {}    # region -> [total_sales, transaction_count]
+        self.products = {}   # product name -> [quantity, revenue, first_seen]
+        self.customers = {}  # customer id -> [total_spent, purchase_count, first_seen]
+        self.daily = {}      # date -> [revenue, transaction_count, set(customer ids)]
+
+        # Keys changed since the last report_stats() call
+        self.dirty_products = set()
+        self.dirty_customers = set()
+        self.dirty_days = set()
+
+        # Results kept up to date between report_stats() calls
+        self.top_product_names = []
+        self.top_customer_ids = []
+        self.low_product_names = set()
+        self.daily_trend = {}
+        self.peak_date = None
+
+    def add(self, tx):
+        amount = tx["Quantity"] * tx["UnitPrice"]
+        date = tx["Date"]
+
+        self.total_revenue += amount
+        self.transaction_count += 1
+
+        if self.min_date is None or date < self.min_date:
+            self.min_date = date
+        if self.max_date is None or date > self.max_date:
+            self.max_date = date
+
+        region = self.regions.setdefault(tx["Region"], [0.0, 0])
+        region[0] += amount
+        region[1] += 1
+
+        product = self.products.get(tx["ProductName"])
+        if product is None:
+            product = self.products[tx["ProductName"]] = [0, 0.0, len(self.products)]
+        product[0] += tx["Quantity"]
+        product[1] += amount
+        self.dirty_products.add(tx["ProductName"])
+
+        customer = self.customers.get(tx["CustomerID"])
+        if customer is None:
+            customer = self.customers[tx["CustomerID"]] = [0.0, 0, len(self.customers)]
+        customer[0] += amount
+        customer[1] += 1
+        self.dirty_customers.add(tx["CustomerID"])
+
+        day = self.daily.setdefault(date, [0.0, 0, set()])
+        day[0] += amount
+        day[1] += 1
+        day[2].add(tx["CustomerID"])
+        self.dirty_days.add(date)
+
+    def add_all(self, transactions):
+        for tx in transactions:
+            self.add(tx)
+
+    def report_stats(self):
+        """
+        Returns: report stats dict; daily_trend is shared with this object,
+        so render it before adding more transactions
+        """
+
+        # REGIONS (few keys, recomputed since percentages depend on the total)
+        region_stats = {}
+        for name, (total_sales, tx_count) in self.regions.items():
+            region_stats[name] = {
+                "total_sales": total_sales,
+                "transaction_count": tx_count,
+                "percentage": round((total_sales / self.total_revenue) * 100, 2) if self.total_revenue > 0 else 0.0
+            }
+        region_stats = dict(sorted(region_stats.items(), key=lambda x: x[1]["total_sales"], reverse=True))
+
+        # PRODUCTS: a product outside the previous top-N that did not change
+        # cannot have overtaken it. Ties keep first-seen order like sorted()
+        products = self.products
+        candidates = set(self.top_product_names) | self.dirty_products
+        self.top_product_names = heapq.nlargest(
+            self.top_n, candidates, key=lambda name: (products[name][0], -products[name][2])
+        )
+        top_products = [
+            (name, products[name][0], round(products[name][1], 2)) for name in self.top_product_names
+        ]
+
+        # Quantities only grow, so only changed products can enter or leave
+        for name in self.dirty_products:
+            if products[name][0] < self.low_threshold:
+                self.low_product_names.add(name)
+            else:
+                self.low_product_names.discard(name)
+        low_products = [
+            (name, products[name][0], round(products[name][1], 2))
+            for name in sorted(self.low_product_names, key=lambda name: (products[name][0], products[name][2]))
+        ]
+
+        # CUSTOMERS
+        customers = self.customers
+        candidates = set(self.top_customer_ids) | self.dirty_customers
+        self.top_customer_ids = heapq.nlargest(
+            self.top_n, candidates, key=lambda cid: (round(customers[cid][0], 2), -customers[cid][2])
+        )
+        top_customers = []
+        for customer_id in self.top_customer_ids:
+            total_spent, purchase_count, first_seen = customers[customer_id]
+            top_customers.append((customer_id, {
+                "total_spent": round(total_spent, 2),
+                "purchase_count": purchase_count,
+                "avg_order_value": round(total_spent / purchase_count, 2)
+            }))
+
+        # DAILY TREND: update changed days in place; a new day earlier than
+        # the last one forces a re-sort (rare for append-only exports)
+        resort = False
+        last_date = next(reversed(self.daily_trend), None)
+        for date in sorted(self.dirty_days):
+            revenue, tx_count, day_customers = self.daily[date]
+            if date not in self.daily_trend and last_date is not None and date < last_date:
+                resort = True
+            self.daily_trend[date] = {
+                "revenue": round(revenue, 2),
+                "transaction_count": tx_count,
+                "unique_customers": len(day_customers)
+            }
+            last_date = max(last_date, date) if last_date is not None else date
+        if resort:
+            self.daily_trend = dict(sorted(self.daily_trend.items()))
+
+        # PEAK DAY: highest revenue, earliest date on ties (like find_peak_sales_day)
+        for date in self.dirty_days:
+            if self.peak_date is None:
+                self.peak_date = date
+                continue
+            revenue = self.daily_trend[date]["revenue"]
+            peak_revenue = self.daily_trend[self.peak_date]["revenue"]
+            if revenue > peak_revenue or (revenue == peak_revenue and date < self.peak_date):
+                self.peak_date = date
+
+        if self.peak_date is not None:
+            peak = self.daily_trend[self.peak_date]
+            peak_day = (self.peak_date, peak["revenue"], peak["transaction_count"])
+        else:
+            peak_day = (None, -1, 0)
+
+        self.dirty_products = set()
+        self.dirty_customers = set()
+        self.dirty_days = set()
+
+        return {
+            "records_processed": self.transaction_count,
+            "total_revenue": self.total_revenue,
+            "total_transactions": self.transaction_count,
+            "date_range": (self.min_date, self.max_date) if self.min_date is not None else None,
+            "region_stats": region_stats,
+            "top_products": top_products,
+            "top_customers": top_customers,
+            "daily_trend": self.daily_trend,
+            "peak_day": peak_day,
+            "low_products": low_products
+        }
@@ -58,6 +58,40 @@ def create_product_mapping(api_products):
     return mapping
 
 
+def enrich_transaction(tx, product_mapping):
+    """
+    Returns: copy of one transaction with API_Category/API_Brand/API_Rating/API_Match added
+    """
+
+    enriched_tx = tx.copy()
+
+    try:
+        # Extract numeric ID from ProductID (P101 -> 101)
+        product_id_str = enriched_tx.get("ProductID", "").strip()
+        numeric_id = int(product_id_str.replace("P", ""))
+
+        if numeric_id in product_mapping:
+            info = product_mapping[numeric_id]
+
+            enriched_tx["API_Category"] = info.get("category")
+            enriched_tx["API_Brand"] = info.get("brand")
+            enriched_tx["API_Rating"] = info.get("rating")
+            enriched_tx["API_Match"] = True
+        else:
+            enriched_tx["API_Category"] = None
+            enriched_tx["API_Brand"] = None
+            enriched_tx["API_Rating"] = None
+            enriched_tx["API_Match"] = False
+
+    except Exception:
+        enriched_tx["API_Category"] = None
+        enriched_tx["API_Brand"] = None
+        enriched_tx["API_Rating"] = None
+        enriched_tx["API_Match"] = False
+
+    return enriched_tx
+
+
 def enrich_sales_data(transactions, product_mapping):
     """
     Enriches transaction data with API product information
@@ -67,38 +101,46 @@ def enrich_sales_data(transactions, product_mapping):
     enriched_transactions = []
 
     for tx in transactions:
-        enriched_tx = tx.copy()
+        enriched_transactions.append(enrich_transaction(tx, product_mapping))
+
+    # Save to file
+    save_enriched_data(enriched_transactions, filename="data/enriched_sales_data.txt")
+
+    return enriched_transactions
+
 
-        try:
-            # Extract numeric ID from ProductID (P101 -> 101)
-            product_id_str = enriched_tx.get("ProductID", "").strip()
-            numeric_id = int(product_id_str.replace("P", ""))
+def enrich_sales_stream(transactions, product_mapping, filename="data/enriched_sales_data.txt"):
+    """
+    Streaming version of enrich_sales_data for inputs that do not fit in memory
+
+    Enriched rows are written to filename as they are produced, not kept.
+
+    Returns: dict with total, enriched and failed_products
+             (same as report_generator.summarize_enrichment)
+    """
 
-            if numeric_id in product_mapping:
-                info = product_mapping[numeric_id]
+    summary = {"total": 0, "enriched": 0, "failed_products": set()}
 
-                enriched_tx["API_Category"] = info.get("category")
-                enriched_tx["API_Brand"] = info.get("brand")
-                enriched_tx["API_Rating"] = info.get("rating")
-                enriched_tx["API_Match"] = True
+    def enriched_rows():
+        for tx in transactions:
+            enriched_tx = enrich_transaction(tx, product_mapping)
+
+            summary["total"] += 1
+            if enriched_tx["API_Match"] is True:
+                summary["enriched"] += 1
             else:
-                enriched_tx["API_Category"] = None
-                enriched_tx["API_Brand"] = None
-                enriched_tx["API_Rating"] = None
-                enriched_tx["API_Match"] = False
+                summary["failed_products"].add(enriched_tx.get("ProductName", "Unknown"))
 
-        except Exception:
-            enriched_tx["API_Category"] = None
-            enriched_tx["API_Brand"] = None
-            enriched_tx["API_Rating"] = None
-            enriched_tx["API_Match"] = False
+            yield enriched_tx
 
-        enriched_transactions.append(enriched_tx)
+    rows = enriched_rows()
+    save_enriched_data(rows, filename=filename)
 
-    # Save to file
-    save_enriched_data(enriched_transactions, filename="data/enriched_sales_data.txt")
+    # Finish counting if saving stopped early
+    for _ in rows:
+        pass
 
-    return enriched_transactions
+    return summary
 
 
 def save_enriched_data(enriched_transactions, filename="data/enriched_sales_data.txt"):
@@ -1,5 +1,13 @@
 # utils/data_processor.py
 
+from itertools import islice
+
+from utils.dedup import create_duplicate_checker
+
+
+# Lines parsed/validated together by iter_valid_transactions
+STREAM_BATCH_LINES = 50_000
+
 
 def parse_transactions(raw_lines):
     """
@@ -42,14 +50,26 @@ def parse_transactions(raw_lines):
     return transactions
 
 
-def validate_and_filter(transactions, region=None, min_amount=None, max_amount=None):
+def validate_and_filter(transactions, region=None, min_amount=None, max_amount=None, seen_ids=None,
+                        verbose=True):
     """
     Validates transactions and applies optional filters
+    Repeated TransactionIDs are dropped (first valid occurrence wins)
+
+    seen_ids: optional duplicate checker to share across calls
+              (see utils/dedup.py); a fresh one is used if not given
+    verbose: print filter options and per-filter counts
+
     Returns: tuple (valid_transactions, invalid_count, filter_summary)
     """
 
     valid_transactions = []
     invalid_count = 0
+    duplicate_count = 0
+
+    own_checker = seen_ids is None
+    if own_checker:
+        seen_ids = create_duplicate_checker(len(transactions))
 
     available_regions = set()
     amounts = []
@@ -87,6 +107,11 @@ def validate_and_filter(transactions, region=None, min_amount=None, max_amount=N
             invalid_count += 1
             continue
 
+        # Duplicate TransactionID check
+        if seen_ids.is_duplicate(tx["TransactionID"]):
+            duplicate_count += 1
+            continue
+
         # Amount calculation
         amount = tx["Quantity"] * tx["UnitPrice"]
         tx["Amount"] = amount
@@ -96,15 +121,40 @@ def validate_and_filter(transactions, region=None, min_amount=None, max_amount=N
 
         valid_transactions.append(tx)
 
+    if own_checker:
+        seen_ids.close()
+
     # Display filter options
-    print("Available Regions:", sorted(list(available_regions)))
+    if verbose:
+        print("Duplicates Removed:", duplicate_count)
+        print("Available Regions:", sorted(list(available_regions)))
+
+        if amounts:
+            print("Transaction Amount Range (min-max):", min(amounts), "-", max(amounts))
+        else:
+            print("Transaction Amount Range (min-max): 0 - 0")
+
+    summary = {
+        "total_input": len(transactions),
+        "invalid": invalid_count,
+        "duplicates": duplicate_count
+    }
+
+    filtered, summary = apply_filters(valid_transactions, region, min_amount, max_amount, summary, verbose)
+
+    return filtered, invalid_count, summary
+
 
-    if amounts:
-        print("Transaction Amount Range (min-max):", min(amounts), "-", max(amounts))
-    else:
-        print("Transaction Amount Range (min-max): 0 - 0")
+def apply_filters(valid_transactions, region=None, min_amount=None, max_amount=None, summary=None, verbose=True):
+    """
+    Applies region/amount filters to already validated transactions
+    (so callers can re-filter without validating again)
+
+    summary: optional validation summary to extend with the filter counts
+
+    Returns: tuple (filtered_transactions, filter_summary)
+    """
 
-    # Apply filters
     filtered = valid_transactions.copy()
     filtered_by_region = 0
     filtered_by_amount = 0
@@ -113,26 +163,55 @@ def validate_and_filter(transactions, region=None, min_amount=None, max_amount=N
         before = len(filtered)
         filtered = [t for t in filtered if t["Region"] == region]
         filtered_by_region = before - len(filtered)
-        print(f"After Region filter '{region}': {len(filtered)} records")
+        if verbose:
+            print(f"After Region filter '{region}': {len(filtered)} records")
 
     if min_amount is not None:
         before = len(filtered)
         filtered = [t for t in filtered if t["Amount"] >= min_amount]
         filtered_by_amount += before - len(filtered)
-        print(f"After Min Amount filter {min_amount}: {len(filtered)} records")
+        if verbose:
+            print(f"After Min Amount filter {min_amount}: {len(filtered)} records")
 
     if max_amount is not None:
         before = len(filtered)
         filtered = [t for t in filtered if t["Amount"] <= max_amount]
         filtered_by_amount += before - len(filtered)
-        print(f"After Max Amount filter {max_amount}: {len(filtered)} records")
+        if verbose:
+            print(f"After Max Amount filter {max_amount}: {len(filtered)} records")
 
-    summary = {
-        "total_input": len(transactions),
-        "invalid": invalid_count,
-        "filtered_by_region": filtered_by_region,
-        "filtered_by_amount": filtered_by_amount,
-        "final_count": len(filtered)
-    }
+    summary = dict(summary or {})
+    summary["filtered_by_region"] = filtered_by_region
+    summary["filtered_by_amount"] = filtered_by_amount
+    summary["final_count"] = len(filtered)
 
-    return filtered, invalid_count, summary
+    return filtered, summary
+
+
+def iter_valid_transactions(raw_lines, seen_ids, summary, batch_size=STREAM_BATCH_LINES):
+    """
+    Parses and validates a stream of raw lines batch by batch
+
+    seen_ids: duplicate checker shared by all batches (see utils/dedup.py)
+    summary: dict with total_input/invalid/duplicates counts, updated in place
+
+    Returns: iterator of valid transactions (the same rows validate_and_filter
+             gives for the whole input, without holding it in memory)
+    """
+
+    lines = iter(raw_lines)
+
+    while True:
+        batch = list(islice(lines, batch_size))
+        if not batch:
+            return
+
+        valid, invalid_count, batch_summary = validate_and_filter(
+            parse_transactions(batch), seen_ids=seen_ids, verbose=False
+        )
+
+        summary["total_input"] += batch_summary["total_input"]
+        summary["invalid"] += batch_summary["invalid"]
+        summary["duplicates"] += batch_summary["duplicates"]
+
+        yield from valid
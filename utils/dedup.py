@@ -0,0 +1,125 @@
+# utils/dedup.py
+
+import hashlib
+import os
+import sqlite3
+import tempfile
+
+
+# Up to this many expected IDs we keep an exact Python set in memory.
+# Above it we switch to a Bloom filter backed by an on-disk exact store.
+EXACT_SET_LIMIT = 5_000_000
+
+# Bloom filter size per expected ID (~2% false positives with 64-bit blocks)
+BLOOM_BITS_PER_ID = 12
+
+# Number of new IDs buffered before they are written to the disk store
+DISK_BATCH_SIZE = 250_000
+
+
+class ExactIdSet:
+    """
+    Exact duplicate checker using an in-memory set
+    """
+
+    def __init__(self):
+        self.seen = set()
+
+    def is_duplicate(self, tx_id):
+        """
+        Returns True if tx_id was already seen, otherwise remembers it
+        """
+        if tx_id in self.seen:
+            return True
+        self.seen.add(tx_id)
+        return False
+
+    def close(self):
+        self.seen = set()
+
+
+# Two bit positions (6 bits each) per 12-bit value -> 64-bit mask
+_PAIR_MASKS = [(1 << (v & 63)) | (1 << (v >> 6)) for v in range(4096)]
+
+
+class BloomIdSet:
+    """
+    Duplicate checker for very large inputs
+
+    - A blocked Bloom filter answers "definitely new" for most IDs without
+      disk I/O: one 128-bit digest picks a 64-bit word and 8 bits inside it,
+      so each check is a single word read/write
+    - Possible hits are confirmed against an exact SQLite store on disk
+    """
+
+    def __init__(self, expected_count, bits_per_id=BLOOM_BITS_PER_ID, db_path=None):
+        expected_count = max(int(expected_count), 1)
+
+        self.num_words = max(expected_count * bits_per_id // 64, 1)
+        self.words = memoryview(bytearray(self.num_words * 8)).cast("Q")
+
+        self._owns_db = db_path is None
+        if db_path is None:
+            fd, db_path = tempfile.mkstemp(prefix="sales_ids_", suffix=".db")
+            os.close(fd)
+        self.db_path = db_path
+
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=OFF")
+        self.conn.execute("PRAGMA synchronous=OFF")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS seen_ids (id TEXT PRIMARY KEY) WITHOUT ROWID")
+        self.pending = set()
+
+    def _flush(self):
+        if self.pending:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO seen_ids (id) VALUES (?)",
+                [(tx_id,) for tx_id in sorted(self.pending)]
+            )
+            self.pending = set()
+
+    def is_duplicate(self, tx_id):
+        """
+        Returns True if tx_id was already seen, otherwise remembers it
+        """
+        digest = int.from_bytes(hashlib.blake2b(tx_id.encode("utf-8"), digest_size=16).digest(), "little")
+        index = digest % self.num_words
+        mask = (
+            _PAIR_MASKS[(digest >> 64) & 4095] | _PAIR_MASKS[(digest >> 76) & 4095] |
+            _PAIR_MASKS[(digest >> 88) & 4095] | _PAIR_MASKS[(digest >> 100) & 4095]
+        )
+        word = self.words[index]
+
+        if word & mask == mask:
+            # Possible false positive - confirm with the exact store
+            if tx_id in self.pending:
+                return True
+            row = self.conn.execute("SELECT 1 FROM seen_ids WHERE id = ?", (tx_id,)).fetchone()
+            if row is not None:
+                return True
+        else:
+            self.words[index] = word | mask
+
+        self.pending.add(tx_id)
+        if len(self.pending) >= DISK_BATCH_SIZE:
+            self._flush()
+
+        return False
+
+    def close(self):
+        self.pending = set()
+        self.words.release()
+        self.conn.close()
+        if self._owns_db and os.path.exists(self.db_path):
+            os.remove(self.db_path)
+
+
+def create_duplicate_checker(expected_count, exact_limit=EXACT_SET_LIMIT):
+    """
+    Picks a duplicate checker based on the expected number of IDs
+
+    Returns: ExactIdSet for moderate volumes, BloomIdSet above exact_limit
+    """
+    if expected_count > exact_limit:
+        return BloomIdSet(expected_count)
+    return ExactIdSet()
@@ -0,0 +1,61 @@
+# utils/fan_out.py
+
+from utils.analytics import RunningAggregates
+
+
+GLOBAL_SINK = "all"
+
+
+def parse_amount_band(text):
+    """
+    Parses an amount band like "1000:5000", ":5000" or "1000:"
+    Returns: tuple (min_amount, max_amount), either may be None
+    """
+
+    if ":" not in text:
+        raise ValueError(f"Amount band must look like MIN:MAX, got '{text}'")
+
+    min_text, max_text = text.split(":", 1)
+    min_amount = float(min_text) if min_text.strip() else None
+    max_amount = float(max_text) if max_text.strip() else None
+    return (min_amount, max_amount)
+
+
+def amount_band_name(min_amount, max_amount):
+    low = f"{min_amount:g}" if min_amount is not None else "min"
+    high = f"{max_amount:g}" if max_amount is not None else "max"
+    return f"amount_{low}-{high}"
+
+
+def fan_out_aggregates(transactions, amount_bands=None, per_region=True):
+    """
+    Feeds every transaction, in a single pass, into multiple aggregation sinks
+
+    - GLOBAL_SINK gets everything
+    - "region_<name>" gets each region's transactions (if per_region)
+    - one sink per (min_amount, max_amount) band, bounds inclusive like
+      validate_and_filter
+
+    Returns: dict sink name -> RunningAggregates
+    """
+
+    sinks = {GLOBAL_SINK: RunningAggregates()}
+    bands = [(amount_band_name(lo, hi), lo, hi) for lo, hi in (amount_bands or [])]
+    for name, lo, hi in bands:
+        sinks[name] = RunningAggregates()
+
+    for tx in transactions:
+        sinks[GLOBAL_SINK].add(tx)
+
+        if per_region:
+            name = f"region_{tx['Region']}"
+            if name not in sinks:
+                sinks[name] = RunningAggregates()
+            sinks[name].add(tx)
+
+        amount = tx["Quantity"] * tx["UnitPrice"]
+        for name, lo, hi in bands:
+            if (lo is None or amount >= lo) and (hi is None or amount <= hi):
+                sinks[name].add(tx)
+
+    return sinks
@@ -1,6 +1,199 @@
 # utils/file_handler.py
 
-def read_sales_data(filename):
+import bz2
+import gzip
+import io
+import lzma
+import mmap
+import re
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# Encodings tried in order when reading sales files
+SALES_ENCODINGS = ["utf-8", "latin-1", "cp1252"]
+
+# Compressed bytes fed per call when decompressing one member in-process
+MEMBER_READ_BYTES = 1024 * 1024
+
+# Leading bytes of each supported compressed format
+MAGIC_BYTES = {
+    "gzip": b"\x1f\x8b",
+    "bz2": b"BZh",
+    "xz": b"\xfd7zXZ\x00",
+    "zstd": b"\x28\xb5\x2f\xfd",
+}
+
+# Byte patterns that can start a gzip member / bz2 stream / xz stream.
+# Files made of several members (concatenated .gz/.xz files, bgzip,
+# pbzip2) are split on these for parallel decompression. The same bytes
+# can also occur inside compressed data; such false matches are never
+# trusted (see decompress_parallel).
+MEMBER_START_PATTERNS = {
+    "gzip": re.compile(b"\x1f\x8b\x08"),
+    "bz2": re.compile(b"BZh[1-9]1AY&SY"),
+    "xz": re.compile(b"\xfd7zXZ\x00"),
+}
+
+
+def detect_compression(filename):
+    """
+    Detects compression from the file's leading bytes
+    Returns: "gzip", "bz2", "xz", "zstd" or None for plain text
+    """
+
+    with open(filename, "rb") as f:
+        head = f.read(6)
+
+    for fmt, magic in MAGIC_BYTES.items():
+        if head.startswith(magic):
+            return fmt
+    return None
+
+
+def open_sales_file(filename, encoding, compression=None):
+    """
+    Opens a (possibly compressed) file as a text stream
+
+    Data is decompressed on the fly while reading; nothing is written to disk.
+    """
+
+    if compression == "gzip":
+        return gzip.open(filename, "rt", encoding=encoding)
+    if compression == "bz2":
+        return bz2.open(filename, "rt", encoding=encoding)
+    if compression == "xz":
+        return lzma.open(filename, "rt", encoding=encoding)
+    if compression == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstd input requires the 'zstandard' package (pip install zstandard)")
+        raw = open(filename, "rb")
+        reader = zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True, closefd=True)
+        return io.TextIOWrapper(reader, encoding=encoding)
+    return open(filename, "r", encoding=encoding)
+
+
+def _new_decompressor(compression):
+    if compression == "gzip":
+        return zlib.decompressobj(wbits=31)
+    if compression == "bz2":
+        return bz2.BZ2Decompressor()
+    return lzma.LZMADecompressor(format=lzma.FORMAT_XZ)
+
+
+def _decompress_members(data, compression):
+    """
+    Decompresses data made of one or more complete members
+    Returns: bytes, or None if data does not end exactly on a member boundary
+    """
+
+    chunks = []
+    while data:
+        decompressor = _new_decompressor(compression)
+        try:
+            chunks.append(decompressor.decompress(data))
+        except (OSError, EOFError, ValueError, zlib.error, lzma.LZMAError):
+            return None
+        if not decompressor.eof:
+            return None
+        data = decompressor.unused_data
+        if compression in ("gzip", "xz"):
+            # gzip/xz readers accept null-byte padding between members
+            data = data.lstrip(b"\x00")
+    return b"".join(chunks)
+
+
+def _decompress_segment(job):
+    filename, compression, start, end = job
+    with open(filename, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    return _decompress_members(data, compression)
+
+
+def _decompress_one_member(mm, pos, compression):
+    """
+    Decompresses the single member starting at pos
+    Returns: tuple (decompressed bytes, offset where the next member starts)
+    """
+
+    decompressor = _new_decompressor(compression)
+    chunks = []
+    offset = pos
+    while not decompressor.eof:
+        data = mm[offset:offset + MEMBER_READ_BYTES]
+        if not data:
+            raise ValueError(f"Truncated {compression} data at offset {pos}")
+        chunks.append(decompressor.decompress(data))
+        offset += len(data)
+
+    end = offset - len(decompressor.unused_data)
+    if compression in ("gzip", "xz"):
+        while end < len(mm) and mm[end] == 0:
+            end += 1
+    return b"".join(chunks), end
+
+
+def decompress_parallel(filename, compression, workers):
+    """
+    Decompresses a multi-member gzip/bz2/xz file using worker processes
+
+    - Candidate member starts are found by scanning for header bytes
+    - Workers speculatively decompress each segment between candidates
+    - This process walks the file member by member: at each real member
+      boundary (known from the decompressor's unused_data) it takes the
+      worker's result if that segment was exactly whole members, otherwise
+      it decompresses the member itself. Each byte is decompressed at most
+      once here, so a single-member file with false header matches costs
+      about the same as plain serial decompression
+
+    Returns: decompressed bytes, or None if there is only one candidate
+    """
+
+    with open(filename, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            size = len(mm)
+            starts = [m.start() for m in MEMBER_START_PATTERNS[compression].finditer(mm)]
+
+            if len(starts) < 2 or starts[0] != 0:
+                return None
+
+            bounds = starts + [size]
+            segment_at = {start: i for i, start in enumerate(starts)}
+
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                # Segment 0 always starts on a real member; it is done here
+                futures = {
+                    i: pool.submit(_decompress_segment, (filename, compression, bounds[i], bounds[i + 1]))
+                    for i in range(1, len(starts))
+                }
+
+                chunks = []
+                pos = 0
+                while pos < size:
+                    i = segment_at.get(pos)
+                    if i:
+                        result = futures[i].result()
+                        if result is not None:
+                            chunks.append(result)
+                            pos = bounds[i + 1]
+                            continue
+
+                    data, pos = _decompress_one_member(mm, pos, compression)
+                    chunks.append(data)
+
+                for future in futures.values():
+                    future.cancel()
+
+    return b"".join(chunks)
+
+
+def read_sales_data(filename, workers=None):
     """
     Reads sales data from file handling encoding issues
 
@@ -12,15 +205,34 @@ def read_sales_data(filename):
     - Handle FileNotFoundError with appropriate error message
     - Skip the header row
     - Remove empty lines
+
+    Compressed files (.gz/.bz2/.xz, and .zst if 'zstandard' is installed)
+    are detected from their leading bytes and decompressed while reading.
+    With workers > 1, multi-member gzip/bz2/xz files are decompressed
+    in parallel worker processes.
     """
 
-    encodings = ["utf-8", "latin-1", "cp1252"]
     lines = None
 
-    for enc in encodings:
+    try:
+        compression = detect_compression(filename)
+    except FileNotFoundError:
+        print(f"Error: File '{filename}' not found.")
+        return []
+
+    data = None
+    if workers and workers > 1 and compression in MEMBER_START_PATTERNS:
+        data = decompress_parallel(filename, compression, workers)
+
+    for enc in SALES_ENCODINGS:
         try:
-            with open(filename, "r", encoding=enc) as f:
-                lines = f.readlines()
+            if data is not None:
+                # Same line splitting as text-mode readlines() (not str.splitlines,
+                # which also breaks on \x85, \x0c, \u2028, ...)
+                lines = io.StringIO(data.decode(enc), newline=None).readlines()
+            else:
+                with open_sales_file(filename, enc, compression) as f:
+                    lines = f.readlines()
             break
         except UnicodeDecodeError:
             continue
@@ -39,3 +251,24 @@ def read_sales_data(filename):
             cleaned_lines.append(line)
 
     return cleaned_lines
+
+
+def iter_sales_lines(filename, encoding, compression=None):
+    """
+    Streams the cleaned lines of a (possibly compressed) sales file
+
+    - Same lines as read_sales_data for that encoding (header skipped,
+      empty lines removed), but one at a time, so the file never has to
+      fit in memory
+    - Raises UnicodeDecodeError if the file is not in this encoding;
+      callers retry with the next one from SALES_ENCODINGS
+    """
+
+    with open_sales_file(filename, encoding, compression) as f:
+        # Skip header
+        next(f, None)
+
+        for line in f:
+            line = line.strip()
+            if line:
+                yield line
@@ -0,0 +1,218 @@
+# utils/live_tail.py
+
+import os
+import time
+
+from utils.analytics import RunningAggregates
+from utils.data_processor import parse_transactions, validate_and_filter
+from utils.dedup import create_duplicate_checker
+from utils.report_generator import write_report
+
+
+# Lines parsed/validated together per micro-batch
+MICRO_BATCH_LINES = 5_000
+
+# Max bytes read from the file per poll
+READ_CHUNK_BYTES = 4 * 1024 * 1024
+
+HEADER_PREFIX = "TransactionID|"
+
+
+def decode_line(raw_line):
+    """
+    Decodes one raw line using the same encoding fallback as read_sales_data
+    """
+    for enc in ["utf-8", "latin-1", "cp1252"]:
+        try:
+            return raw_line.decode(enc)
+        except UnicodeDecodeError:
+            continue
+    return ""
+
+
+class SalesFileTail:
+    """
+    Follows an append-only sales file and folds new lines into RunningAggregates
+
+    - Remembers the byte offset of the last complete line read
+    - A trailing partial line is left for the next poll; a last line without
+      a newline is taken once the file size is unchanged since the previous
+      poll (the writer is done), or when following stops
+    - A line longer than READ_CHUNK_BYTES is skipped (with a warning)
+    - If the file shrinks (truncated/rotated), state is reset and it is re-read
+
+    expected_rows: expected number of transactions over the whole run; sizes
+                   the duplicate checker (see dedup.create_duplicate_checker)
+    """
+
+    def __init__(self, filename, expected_rows=None):
+        self.filename = filename
+        self.expected_rows = expected_rows
+        self.seen_ids = None
+        self.reset()
+
+    def reset(self):
+        if self.seen_ids is not None:
+            self.seen_ids.close()
+        self.offset = 0
+        self.discarding = False
+        self.unterminated_size = None
+        self.aggregates = RunningAggregates()
+        self.seen_ids = create_duplicate_checker(self.expected_rows or 0)
+        self.filter_summary = {"total_input": 0, "invalid": 0, "duplicates": 0}
+
+    def read_new_lines(self, final=False):
+        """
+        final: also take a last line that has no trailing newline
+
+        Returns: list of new complete lines (decoded, stripped, non-empty)
+        """
+        try:
+            size = os.path.getsize(self.filename)
+        except FileNotFoundError:
+            return []
+
+        if size < self.offset:
+            self.reset()
+
+        if size == self.offset:
+            return []
+
+        with open(self.filename, "rb") as f:
+            while True:
+                f.seek(self.offset)
+                data = f.read(READ_CHUNK_BYTES)
+                if not data:
+                    return []
+
+                if self.discarding:
+                    # Inside an oversized line: drop everything up to its newline
+                    newline = data.find(b"\n")
+                    if newline == -1:
+                        self.offset += len(data)
+                    else:
+                        self.offset += newline + 1
+                        self.discarding = False
+                    continue
+
+                end = data.rfind(b"\n")
+                if end != -1:
+                    break
+                if len(data) < READ_CHUNK_BYTES:
+                    if final or size == self.unterminated_size:
+                        # No newline, but the file stopped growing: take it
+                        end = len(data) - 1
+                        break
+                    # Last line may still be being written
+                    self.unterminated_size = size
+                    return []
+
+                print(f"⚠ Skipping a line longer than {READ_CHUNK_BYTES} bytes at offset {self.offset}")
+                self.offset += len(data)
+                self.discarding = True
+
+        data = data[:end + 1]
+        start_offset = self.offset
+        self.offset += len(data)
+
+        lines = []
+        for raw_line in data.split(b"\n"):
+            line = decode_line(raw_line).strip()
+            if line:
+                lines.append(line)
+
+        # Skip the header row at the start of the file
+        if start_offset == 0 and lines and lines[0].startswith(HEADER_PREFIX):
+            lines = lines[1:]
+
+        return lines
+
+    def close(self):
+        self.seen_ids.close()
+
+    def process_lines(self, lines, batch_size=MICRO_BATCH_LINES):
+        """
+        Parses, validates and aggregates lines in micro-batches
+        Returns: number of valid transactions added
+        """
+        added = 0
+
+        for i in range(0, len(lines), batch_size):
+            transactions = parse_transactions(lines[i:i + batch_size])
+            valid, invalid_count, summary = validate_and_filter(
+                transactions, seen_ids=self.seen_ids, verbose=False
+            )
+
+            self.filter_summary["total_input"] += summary["total_input"]
+            self.filter_summary["invalid"] += summary["invalid"]
+            self.filter_summary["duplicates"] += summary["duplicates"]
+
+            self.aggregates.add_all(valid)
+            added += len(valid)
+
+        return added
+
+    def poll(self, final=False):
+        """
+        Reads everything appended since the last poll
+        final: also take a last line without a trailing newline
+        Returns: number of valid transactions added
+        """
+        added = 0
+        while True:
+            lines = self.read_new_lines(final)
+            if not lines:
+                return added
+            added += self.process_lines(lines)
+
+
+def follow_sales_file(filename, output_file="output/sales_report.txt", interval=5.0,
+                      poll_interval=1.0, max_updates=None, expected_rows=None):
+    """
+    Live tail mode: keeps the report in sync with an appended sales file
+
+    - Polls the file every poll_interval seconds for new lines
+    - Rewrites the report (atomically) at most every interval seconds,
+      and only when new transactions arrived
+    - Stops on Ctrl+C, or after max_updates report writes if given
+    - expected_rows sizes duplicate detection (see SalesFileTail)
+    """
+
+    tail = SalesFileTail(filename, expected_rows=expected_rows)
+    last_write = None
+    pending = 0
+    updates = 0
+
+    print(f"Following {filename} (report every {interval}s, Ctrl+C to stop)")
+
+    try:
+        while max_updates is None or updates < max_updates:
+            pending += tail.poll()
+
+            now = time.monotonic()
+            due = last_write is None or now - last_write >= interval
+
+            if due and (pending > 0 or last_write is None):
+                write_report(tail.aggregates.report_stats(), None, output_file=output_file,
+                             filter_summary=tail.filter_summary)
+                print(f"✓ +{pending} transactions | Total: {tail.aggregates.transaction_count}")
+                last_write = now
+                pending = 0
+                updates += 1
+                continue
+
+            time.sleep(poll_interval)
+
+    except KeyboardInterrupt:
+        # Count a last line without a trailing newline before stopping
+        pending += tail.poll(final=True)
+        if pending > 0:
+            write_report(tail.aggregates.report_stats(), None, output_file=output_file,
+                         filter_summary=tail.filter_summary)
+            print(f"✓ +{pending} transactions | Total: {tail.aggregates.transaction_count}")
+        print("\nStopped following.")
+
+    finally:
+        tail.close()
+
+    return tail
@@ -1,5 +1,8 @@
 # utils/report_generator.py
 
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from utils.analytics import (
     calculate_total_revenue,
@@ -10,6 +13,8 @@ from utils.analytics import (
     find_peak_sales_day,
     low_performing_products
 )
+from utils.spill_grouping import customer_analysis_spilled, top_selling_products_spilled
+from utils.sqlite_backend import sql_report_stats
 
 
 def format_money(amount, currency="₹"):
@@ -19,34 +24,167 @@ def format_money(amount, currency="₹"):
         return f"{currency}0.00"
 
 
-def generate_sales_report(transactions, enriched_transactions, output_file="output/sales_report.txt"):
-    # BASIC METRICS
-    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    total_records_processed = len(transactions)
+def build_report_stats(transactions, memory_limit_mb=None):
+    """
+    Computes every metric the report needs from in-memory transactions
+
+    memory_limit_mb: if set, customer and product grouping spill to disk
+                     above this budget (see utils/spill_grouping.py)
+
+    Returns: dict (same shape as utils.sqlite_backend.sql_report_stats)
+    """
 
     total_revenue = calculate_total_revenue(transactions)
-    total_transactions = len(transactions)
-    avg_order_value = total_revenue / total_transactions if total_transactions > 0 else 0.0
 
     dates = [t["Date"] for t in transactions] if transactions else []
-    date_range = f"{min(dates)} to {max(dates)}" if dates else "N/A"
 
-    # REGION STATS
-    region_stats = region_wise_sales(transactions)
+    if memory_limit_mb is not None:
+        top_products = top_selling_products_spilled(transactions, n=5, memory_limit_mb=memory_limit_mb)
+        customer_stats = customer_analysis_spilled(transactions, top_n=5, memory_limit_mb=memory_limit_mb)
+    else:
+        top_products = top_selling_products(transactions, n=5)
+        customer_stats = customer_analysis(transactions)
+
+    return {
+        "records_processed": len(transactions),
+        "total_revenue": total_revenue,
+        "total_transactions": len(transactions),
+        "date_range": (min(dates), max(dates)) if dates else None,
+        "region_stats": region_wise_sales(transactions),
+        "top_products": top_products,
+        "top_customers": list(customer_stats.items())[:5],
+        "daily_trend": daily_sales_trend(transactions),
+        "peak_day": find_peak_sales_day(transactions),
+        "low_products": low_performing_products(transactions, threshold=10)
+    }
+
+
+def summarize_enrichment(enriched_transactions):
+    """
+    Returns: dict with total, enriched (API_Match rows) and failed_products
+    """
+
+    summary = {"total": 0, "enriched": 0, "failed_products": set()}
+
+    for tx in enriched_transactions:
+        summary["total"] += 1
+        if tx.get("API_Match") is True:
+            summary["enriched"] += 1
+        else:
+            summary["failed_products"].add(tx.get("ProductName", "Unknown"))
+
+    return summary
+
+
+def generate_sales_report(transactions, enriched_transactions, output_file="output/sales_report.txt",
+                          filter_summary=None, db_conn=None, db_filters=None, memory_limit_mb=None,
+                          enrichment_summary=None):
+    """
+    Builds report metrics and writes the report
+
+    db_conn: optional SQLite connection (utils/sqlite_backend.py); when given,
+             metrics come from SQL aggregations instead of `transactions`
+    db_filters: optional dict of region/min_amount/max_amount for the SQL path
+    memory_limit_mb: optional RAM ceiling for customer/product grouping
+    enrichment_summary: optional summarize_enrichment-style dict, used
+                        instead of enriched_transactions (streamed enrichment)
+    """
+
+    if db_conn is not None:
+        stats = sql_report_stats(db_conn, **(db_filters or {}))
+    else:
+        stats = build_report_stats(transactions, memory_limit_mb=memory_limit_mb)
+
+    write_report(stats, enriched_transactions, output_file=output_file, filter_summary=filter_summary,
+                 enrichment_summary=enrichment_summary)
+
+
+def generate_fan_out_reports(report_stats, enriched_transactions, output_dir="output",
+                             filter_summary=None, workers=None, global_name="all"):
+    """
+    Renders several reports from precomputed stats (one scan, N renders)
+
+    report_stats: dict name -> stats dict (e.g. RunningAggregates.report_stats())
+    - The report named global_name goes to sales_report.txt and gets the
+      API enrichment summary; the others go to sales_report_<name>.txt,
+      with <name> made filename-safe (the raw name stays in the header)
+    - workers > 1 renders in parallel worker processes
+
+    Returns: list of written file paths
+    """
+
+    jobs = []
+    used_names = set()
+    for name, stats in report_stats.items():
+        if name == global_name:
+            output_file = os.path.join(output_dir, "sales_report.txt")
+            jobs.append((stats, enriched_transactions, output_file, filter_summary, None))
+        else:
+            output_file = os.path.join(output_dir, f"sales_report_{safe_report_name(name, used_names)}.txt")
+            jobs.append((stats, None, output_file, None, name))
+
+    if workers and workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(_write_report_job, jobs))
+    else:
+        for job in jobs:
+            _write_report_job(job)
+
+    return [job[2] for job in jobs]
+
+
+def safe_report_name(name, used_names):
+    """
+    Makes a sink name usable as a file name (e.g. region "North/East")
+    Keeps names unique by adding a numeric suffix when two names collide
+    """
+
+    safe = re.sub(r"[^A-Za-z0-9_.-]", "_", name).strip(".") or "report"
+    candidate = safe
+    counter = 2
+    while candidate in used_names:
+        candidate = f"{safe}_{counter}"
+        counter += 1
+    used_names.add(candidate)
+    return candidate
+
+
+def _write_report_job(job):
+    stats, enriched_transactions, output_file, filter_summary, report_name = job
+    write_report(stats, enriched_transactions, output_file=output_file, filter_summary=filter_summary,
+                 report_name=report_name)
 
-    # TOP PRODUCTS
-    top_products = top_selling_products(transactions, n=5)
 
-    # TOP CUSTOMERS
-    customer_stats = customer_analysis(transactions)
-    top_customers_list = list(customer_stats.items())[:5]
+def write_report(stats, enriched_transactions, output_file="output/sales_report.txt", filter_summary=None,
+                 report_name=None, enrichment_summary=None):
+    """
+    Writes the text report from a stats dict (see build_report_stats)
 
-    # DAILY TREND
-    daily_trend = daily_sales_trend(transactions)
+    - enriched_transactions=None (and no enrichment_summary) marks API
+      enrichment as skipped
+    - report_name (optional) is shown in the header, e.g. "region_North"
+    - The report is written to a temp file and renamed into place, so
+      readers never see a half-written report
+    """
+
+    # BASIC METRICS
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    total_records_processed = stats["records_processed"]
+
+    total_revenue = stats["total_revenue"]
+    total_transactions = stats["total_transactions"]
+    avg_order_value = total_revenue / total_transactions if total_transactions > 0 else 0.0
+
+    date_range = f"{stats['date_range'][0]} to {stats['date_range'][1]}" if stats["date_range"] else "N/A"
+
+    region_stats = stats["region_stats"]
+    top_products = stats["top_products"]
+    top_customers_list = stats["top_customers"]
+    daily_trend = stats["daily_trend"]
 
     # PRODUCT PERFORMANCE
-    peak_day, peak_revenue, peak_count = find_peak_sales_day(transactions)
-    low_products = low_performing_products(transactions, threshold=10)
+    peak_day, peak_revenue, peak_count = stats["peak_day"]
+    low_products = stats["low_products"]
 
     # Average transaction value per region
     avg_tx_value_region = {}
@@ -55,24 +193,29 @@ def generate_sales_report(transactions, enriched_transactions, output_file="outp
         avg_tx_value_region[region] = stats["total_sales"] / tx_count if tx_count > 0 else 0.0
 
     # API ENRICHMENT SUMMARY
-    total_enriched = 0
-    failed_products = set()
+    if enrichment_summary is None and enriched_transactions is not None:
+        enrichment_summary = summarize_enrichment(enriched_transactions)
 
-    for tx in enriched_transactions:
-        if tx.get("API_Match") is True:
-            total_enriched += 1
-        else:
-            failed_products.add(tx.get("ProductName", "Unknown"))
+    total_enriched = enrichment_summary["enriched"] if enrichment_summary else 0
+    failed_products = enrichment_summary["failed_products"] if enrichment_summary else set()
+    total_rows = enrichment_summary["total"] if enrichment_summary else 0
 
-    success_rate = (total_enriched / len(enriched_transactions) * 100) if enriched_transactions else 0.0
+    success_rate = (total_enriched / total_rows * 100) if total_rows else 0.0
+
+    # DATA QUALITY (from validate_and_filter summary)
+    duplicates_removed = filter_summary.get("duplicates", 0) if filter_summary else 0
+    invalid_removed = filter_summary.get("invalid", 0) if filter_summary else 0
 
     # WRITE REPORT
-    with open(output_file, "w", encoding="utf-8") as f:
+    tmp_file = output_file + ".tmp"
+    with open(tmp_file, "w", encoding="utf-8") as f:
         # 1) HEADER
         f.write("=" * 44 + "\n")
         f.write("           SALES ANALYTICS REPORT\n")
         f.write(f"         Generated: {now}\n")
         f.write(f"         Records Processed: {total_records_processed}\n")
+        if report_name:
+            f.write(f"         Report: {report_name}\n")
         f.write("=" * 44 + "\n\n")
 
         # 2) OVERALL SUMMARY
@@ -81,7 +224,11 @@ def generate_sales_report(transactions, enriched_transactions, output_file="outp
         f.write(f"Total Revenue:        {format_money(total_revenue)}\n")
         f.write(f"Total Transactions:   {total_transactions}\n")
         f.write(f"Average Order Value:  {format_money(avg_order_value)}\n")
-        f.write(f"Date Range:           {date_range}\n\n")
+        f.write(f"Date Range:           {date_range}\n")
+        if filter_summary is not None:
+            f.write(f"Invalid Removed:      {invalid_removed}\n")
+            f.write(f"Duplicates Removed:   {duplicates_removed}\n")
+        f.write("\n")
 
         # 3) REGION-WISE PERFORMANCE
         f.write("REGION-WISE PERFORMANCE\n")
@@ -151,14 +298,19 @@ def generate_sales_report(transactions, enriched_transactions, output_file="outp
         # 8) API ENRICHMENT SUMMARY
         f.write("API ENRICHMENT SUMMARY\n")
         f.write("-" * 44 + "\n")
-        f.write(f"Total products enriched: {total_enriched}\n")
-        f.write(f"Success rate: {success_rate:.2f}%\n\n")
-
-        f.write("Products that couldn't be enriched:\n")
-        if len(failed_products) == 0:
-            f.write("None\n")
+        if enrichment_summary is None:
+            f.write("Skipped (not available for this report)\n")
         else:
-            for p in sorted(list(failed_products)):
-                f.write(f"- {p}\n")
+            f.write(f"Total products enriched: {total_enriched}\n")
+            f.write(f"Success rate: {success_rate:.2f}%\n\n")
+
+            f.write("Products that couldn't be enriched:\n")
+            if len(failed_products) == 0:
+                f.write("None\n")
+            else:
+                for p in sorted(list(failed_products)):
+                    f.write(f"- {p}\n")
+
+    os.replace(tmp_file, output_file)
 
     print(f"✅ Report generated successfully: {output_file}")
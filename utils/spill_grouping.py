@@ -0,0 +1,220 @@
+# utils/spill_grouping.py
+
+import heapq
+import os
+import pickle
+import shutil
+import tempfile
+import zlib
+
+
+DEFAULT_MEMORY_LIMIT_MB = 512
+
+# Rough in-memory cost of one group (dict slot + key + state), used to turn
+# a memory budget into a maximum number of keys held at once
+PRODUCT_BYTES_PER_KEY = 300
+CUSTOMER_BYTES_PER_KEY = 800
+
+NUM_PARTITIONS = 64
+
+# Partitions are re-split at most this many times (64^3 ~ 262k partitions)
+MAX_SPILL_DEPTH = 3
+
+
+def _max_keys(memory_limit_mb, bytes_per_key):
+    return max(int(memory_limit_mb * 1024 * 1024 // bytes_per_key), 1)
+
+
+def _partition_of(key, depth, num_partitions):
+    # Salt with depth so a partition that is still too big splits differently
+    return zlib.crc32(f"{depth}:{key}".encode("utf-8")) % num_partitions
+
+
+def _read_entries(path):
+    with open(path, "rb") as f:
+        while True:
+            try:
+                yield pickle.load(f)
+            except EOFError:
+                return
+
+
+def _group_entries(entries, new_state, update, max_keys, num_partitions, spill_dir, depth, overflow):
+    """
+    Groups (kind, key, seq, payload) entries
+
+    kind "R" is a raw value folded in with update(state, payload);
+    kind "S" is a partial state spilled earlier (payload = state).
+    For any key, its "S" entry always comes before its "R" entries, so
+    values are folded in their original order and sums match exactly.
+
+    overflow: dict shared across the recursion; "warned" is set once the
+              memory ceiling had to be exceeded at MAX_SPILL_DEPTH
+    """
+
+    groups = {}
+    files = None
+    part_dir = None
+
+    try:
+        for kind, key, seq, payload in entries:
+            if files is None:
+                entry = groups.get(key)
+
+                if entry is None and len(groups) >= max_keys and depth >= MAX_SPILL_DEPTH and not overflow["warned"]:
+                    # Cannot split further (e.g. one huge partition): keep going
+                    # in memory, but say the ceiling is being exceeded
+                    print(
+                        f"⚠ Warning: a partition still holds more than {max_keys} keys after "
+                        f"{MAX_SPILL_DEPTH} spill levels; memory limit will be exceeded"
+                    )
+                    overflow["warned"] = True
+
+                if entry is None and len(groups) >= max_keys and depth < MAX_SPILL_DEPTH:
+                    # Over budget: dump partial states and route everything
+                    # from here on to hash partitions on disk
+                    part_dir = tempfile.mkdtemp(prefix="sales_spill_", dir=spill_dir)
+                    files = [
+                        open(os.path.join(part_dir, f"part_{i}.pkl"), "wb")
+                        for i in range(num_partitions)
+                    ]
+                    for k, (first_seq, state) in groups.items():
+                        f = files[_partition_of(k, depth, num_partitions)]
+                        pickle.dump(("S", k, first_seq, state), f, pickle.HIGHEST_PROTOCOL)
+                    groups = None
+                else:
+                    if kind == "S":
+                        groups[key] = [seq, payload]
+                        continue
+                    if entry is None:
+                        entry = groups[key] = [seq, new_state()]
+                    update(entry[1], payload)
+                    continue
+
+            f = files[_partition_of(key, depth, num_partitions)]
+            pickle.dump((kind, key, seq, payload), f, pickle.HIGHEST_PROTOCOL)
+
+        if files is None:
+            for key, (first_seq, state) in groups.items():
+                yield key, first_seq, state
+            return
+
+        for f in files:
+            f.close()
+
+        # Each partition holds a disjoint set of keys
+        for i in range(num_partitions):
+            path = os.path.join(part_dir, f"part_{i}.pkl")
+            yield from _group_entries(
+                _read_entries(path), new_state, update, max_keys, num_partitions, spill_dir, depth + 1, overflow
+            )
+            os.remove(path)
+
+    finally:
+        if files is not None:
+            for f in files:
+                f.close()
+        if part_dir is not None:
+            shutil.rmtree(part_dir, ignore_errors=True)
+
+
+def spill_group_by(items, new_state, update, max_keys, num_partitions=NUM_PARTITIONS, spill_dir=None):
+    """
+    Group-by that spills to disk once more than max_keys groups are in memory
+
+    items: iterable of (key, value)
+    new_state(): creates an empty group state
+    update(state, value): folds one value into a state (in place)
+
+    Returns: iterator of (key, first_seen_index, state)
+    - first_seen_index is the position of the key's first item, so callers
+      can reproduce insertion-order tie-breaking of the in-memory versions
+    - Keys come out grouped by partition, not in first-seen order
+    - If a partition is still over max_keys after MAX_SPILL_DEPTH splits
+      (e.g. a budget far too small), it is grouped in memory anyway and a
+      warning is printed
+    """
+
+    entries = (("R", key, seq, value) for seq, (key, value) in enumerate(items))
+    return _group_entries(entries, new_state, update, max_keys, num_partitions, spill_dir, 0, {"warned": False})
+
+
+def _new_product_state():
+    return [0, 0.0]
+
+
+def _update_product(state, value):
+    state[0] += value[0]
+    state[1] += value[1]
+
+
+def top_selling_products_spilled(transactions, n=5, memory_limit_mb=DEFAULT_MEMORY_LIMIT_MB, spill_dir=None):
+    """
+    Same result as analytics.top_selling_products within a memory budget
+    Returns: list of (ProductName, TotalQuantity, TotalRevenue)
+    """
+
+    items = (
+        (tx["ProductName"], (tx["Quantity"], tx["Quantity"] * tx["UnitPrice"]))
+        for tx in transactions
+    )
+    groups = spill_group_by(
+        items, _new_product_state, _update_product,
+        _max_keys(memory_limit_mb, PRODUCT_BYTES_PER_KEY), spill_dir=spill_dir
+    )
+
+    # Highest quantity first; ties keep first-seen order like sorted()
+    top = heapq.nlargest(n, groups, key=lambda g: (g[2][0], -g[1]))
+
+    return [(product, state[0], round(state[1], 2)) for product, first_seq, state in top]
+
+
+def _new_customer_state():
+    return [0.0, 0, set()]
+
+
+def _update_customer(state, value):
+    state[0] += value[0]
+    state[1] += 1
+    state[2].add(value[1])
+
+
+def customer_analysis_spilled(transactions, top_n=None, memory_limit_mb=DEFAULT_MEMORY_LIMIT_MB,
+                              spill_dir=None):
+    """
+    Same result as analytics.customer_analysis within a memory budget
+
+    top_n: only keep the top N customers by total spent (heap-based);
+           None returns every customer, so the result itself must fit in memory
+
+    Returns: dict (sorted by total_spent, highest first)
+    """
+
+    items = (
+        (tx["CustomerID"], (tx["Quantity"] * tx["UnitPrice"], tx["ProductName"]))
+        for tx in transactions
+    )
+    groups = spill_group_by(
+        items, _new_customer_state, _update_customer,
+        _max_keys(memory_limit_mb, CUSTOMER_BYTES_PER_KEY), spill_dir=spill_dir
+    )
+
+    # Highest rounded total first; ties keep first-seen order like sorted()
+    def rank(group):
+        return (round(group[2][0], 2), -group[1])
+
+    if top_n is None:
+        ranked = sorted(groups, key=rank, reverse=True)
+    else:
+        ranked = heapq.nlargest(top_n, groups, key=rank)
+
+    customers = {}
+    for customer_id, first_seq, (total_spent, purchase_count, products) in ranked:
+        customers[customer_id] = {
+            "total_spent": round(total_spent, 2),
+            "purchase_count": purchase_count,
+            "products_bought": sorted(products),
+            "avg_order_value": round(total_spent / purchase_count, 2) if purchase_count > 0 else 0.0
+        }
+
+    return customers
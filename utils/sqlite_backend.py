@@ -0,0 +1,386 @@
+# utils/sqlite_backend.py
+
+import os
+import sqlite3
+
+
+DEFAULT_DB_PATH = "data/sales.db"
+
+# Rows per executemany() call during bulk load
+BATCH_SIZE = 100_000
+
+COLUMNS = [
+    "TransactionID", "Date", "ProductID", "ProductName",
+    "Quantity", "UnitPrice", "CustomerID", "Region", "Amount"
+]
+
+
+def connect_sales_db(db_path=DEFAULT_DB_PATH):
+    """
+    Opens (or creates) the SQLite sales database
+
+    - WAL mode so reports can be re-queried while a load is running
+    - Registers py_round (Python's round) so SQL rankings on rounded
+      values match analytics.py; SQLite's ROUND() rounds differently
+    - Creates the transactions and load_info tables if missing
+
+    Returns: sqlite3.Connection
+    """
+
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.create_function("py_round", 2, round, deterministic=True)
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS transactions (
+            TransactionID TEXT PRIMARY KEY,
+            Date TEXT NOT NULL,
+            ProductID TEXT NOT NULL,
+            ProductName TEXT NOT NULL,
+            Quantity INTEGER NOT NULL,
+            UnitPrice REAL NOT NULL,
+            CustomerID TEXT NOT NULL,
+            Region TEXT NOT NULL,
+            Amount REAL NOT NULL
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS load_info (
+            source TEXT NOT NULL,
+            source_mtime_ns INTEGER NOT NULL,
+            source_size INTEGER NOT NULL,
+            total_input INTEGER NOT NULL,
+            invalid INTEGER NOT NULL,
+            duplicates INTEGER NOT NULL
+        )
+        """
+    )
+    return conn
+
+
+def source_fingerprint(filename):
+    """
+    Identifies a source file version by path, modification time and size
+    Returns: tuple (abs_path, mtime_ns, size), or None if the file is missing
+    """
+
+    try:
+        st = os.stat(filename)
+    except FileNotFoundError:
+        return None
+    return (os.path.abspath(filename), st.st_mtime_ns, st.st_size)
+
+
+def is_source_loaded(conn, filename):
+    """
+    Returns True if the database holds exactly the current version of filename
+    """
+
+    fingerprint = source_fingerprint(filename)
+    if fingerprint is None:
+        return False
+
+    row = conn.execute("SELECT source, source_mtime_ns, source_size FROM load_info").fetchone()
+    return row is not None and tuple(row) == fingerprint
+
+
+def load_summary(conn):
+    """
+    Returns: validation summary (total_input/invalid/duplicates) of the last load
+    """
+
+    row = conn.execute("SELECT total_input, invalid, duplicates FROM load_info").fetchone()
+    if row is None:
+        return {"total_input": 0, "invalid": 0, "duplicates": 0}
+    return {"total_input": row[0], "invalid": row[1], "duplicates": row[2]}
+
+
+def drop_indexes(conn):
+    for name in ["idx_tx_region", "idx_tx_date", "idx_tx_product", "idx_tx_customer"]:
+        conn.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+def create_indexes(conn):
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_tx_region ON transactions (Region)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_tx_date ON transactions (Date)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_tx_product ON transactions (ProductID)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_tx_customer ON transactions (CustomerID)")
+    conn.commit()
+
+
+def load_transactions(conn, transactions, fingerprint=None, summary=None, batch_size=BATCH_SIZE):
+    """
+    Replaces the database contents with validated transactions (any iterable)
+
+    - Previous rows are deleted, so the database always mirrors one input
+    - Inserts in batches with executemany inside one transaction
+    - Indexes are dropped during the load and rebuilt afterwards
+    - fingerprint (from source_fingerprint, taken before the file was read)
+      and summary record which file version was loaded (see is_source_loaded)
+
+    Returns: number of rows inserted
+    """
+
+    inserted = 0
+    batch = []
+
+    def flush():
+        cursor = conn.executemany(
+            "INSERT OR IGNORE INTO transactions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            batch
+        )
+        return cursor.rowcount
+
+    with conn:
+        conn.execute("DELETE FROM transactions")
+        conn.execute("DELETE FROM load_info")
+        drop_indexes(conn)
+
+        for tx in transactions:
+            amount = tx.get("Amount", tx["Quantity"] * tx["UnitPrice"])
+            batch.append((
+                tx["TransactionID"], tx["Date"], tx["ProductID"], tx["ProductName"],
+                tx["Quantity"], tx["UnitPrice"], tx["CustomerID"], tx["Region"], amount
+            ))
+
+            if len(batch) >= batch_size:
+                inserted += flush()
+                batch = []
+
+        if batch:
+            inserted += flush()
+
+        if fingerprint is not None:
+            summary = summary or {}
+            conn.execute(
+                "INSERT INTO load_info VALUES (?, ?, ?, ?, ?, ?)",
+                fingerprint + (
+                    summary.get("total_input", inserted),
+                    summary.get("invalid", 0),
+                    summary.get("duplicates", 0)
+                )
+            )
+
+    create_indexes(conn)
+
+    return inserted
+
+
+def _where(region=None, min_amount=None, max_amount=None):
+    """
+    Builds a WHERE clause matching validate_and_filter's optional filters
+    Returns: tuple (sql, params)
+    """
+
+    clauses = []
+    params = []
+
+    if region:
+        clauses.append("Region = ?")
+        params.append(region)
+
+    if min_amount is not None:
+        clauses.append("Amount >= ?")
+        params.append(min_amount)
+
+    if max_amount is not None:
+        clauses.append("Amount <= ?")
+        params.append(max_amount)
+
+    sql = (" WHERE " + " AND ".join(clauses)) if clauses else ""
+    return sql, params
+
+
+def filter_options_sql(conn):
+    """
+    Returns: tuple (regions, min_amount, max_amount) available for filtering
+    """
+
+    regions = [row[0] for row in conn.execute("SELECT DISTINCT Region FROM transactions ORDER BY Region")]
+    min_amount, max_amount = conn.execute("SELECT MIN(Amount), MAX(Amount) FROM transactions").fetchone()
+    return regions, min_amount, max_amount
+
+
+def iter_transactions_sql(conn, region=None, min_amount=None, max_amount=None):
+    """
+    Streams the (filtered) transactions back in load order
+    Returns: iterator of transaction dicts (parse_transactions keys plus Amount)
+    """
+
+    where, params = _where(region, min_amount, max_amount)
+    cursor = conn.execute(
+        "SELECT " + ", ".join(COLUMNS) + " FROM transactions" + where + " ORDER BY rowid",
+        params
+    )
+    for row in cursor:
+        yield dict(zip(COLUMNS, row))
+
+
+def count_transactions_sql(conn, region=None, min_amount=None, max_amount=None):
+    where, params = _where(region, min_amount, max_amount)
+    return conn.execute("SELECT COUNT(*) FROM transactions" + where, params).fetchone()[0]
+
+
+def calculate_total_revenue_sql(conn, region=None, min_amount=None, max_amount=None):
+    where, params = _where(region, min_amount, max_amount)
+    row = conn.execute("SELECT TOTAL(Quantity * UnitPrice) FROM transactions" + where, params).fetchone()
+    return row[0]
+
+
+def date_range_sql(conn, region=None, min_amount=None, max_amount=None):
+    where, params = _where(region, min_amount, max_amount)
+    row = conn.execute("SELECT MIN(Date), MAX(Date) FROM transactions" + where, params).fetchone()
+    return (row[0], row[1]) if row[0] is not None else None
+
+
+def region_wise_sales_sql(conn, region=None, min_amount=None, max_amount=None):
+    """
+    SQL version of analytics.region_wise_sales
+    """
+
+    where, params = _where(region, min_amount, max_amount)
+    rows = conn.execute(
+        "SELECT Region, TOTAL(Quantity * UnitPrice), COUNT(*) FROM transactions" + where +
+        " GROUP BY Region ORDER BY 2 DESC, MIN(rowid)",
+        params
+    ).fetchall()
+
+    total_sales_all = sum(r[1] for r in rows)
+
+    region_stats = {}
+    for name, total_sales, tx_count in rows:
+        if total_sales_all > 0:
+            percentage = round((total_sales / total_sales_all) * 100, 2)
+        else:
+            percentage = 0.0
+
+        region_stats[name] = {
+            "total_sales": total_sales,
+            "transaction_count": tx_count,
+            "percentage": percentage
+        }
+
+    return region_stats
+
+
+def top_selling_products_sql(conn, n=5, region=None, min_amount=None, max_amount=None):
+    """
+    SQL version of analytics.top_selling_products
+    """
+
+    where, params = _where(region, min_amount, max_amount)
+    rows = conn.execute(
+        "SELECT ProductName, SUM(Quantity), TOTAL(Quantity * UnitPrice) FROM transactions" + where +
+        " GROUP BY ProductName ORDER BY 2 DESC, MIN(rowid) LIMIT ?",
+        params + [n]
+    ).fetchall()
+
+    return [(product, qty, round(revenue, 2)) for product, qty, revenue in rows]
+
+
+def customer_analysis_sql(conn, limit=None, region=None, min_amount=None, max_amount=None):
+    """
+    SQL version of analytics.customer_analysis
+    limit: only return the top N customers by total spent
+    """
+
+    where, params = _where(region, min_amount, max_amount)
+    sql = (
+        "SELECT CustomerID, TOTAL(Quantity * UnitPrice), COUNT(*),"
+        " GROUP_CONCAT(DISTINCT ProductName) FROM transactions" + where +
+        " GROUP BY CustomerID ORDER BY py_round(TOTAL(Quantity * UnitPrice), 2) DESC, MIN(rowid)"
+    )
+    if limit is not None:
+        sql += " LIMIT ?"
+        params = params + [limit]
+
+    customers = {}
+    for customer_id, total_spent, purchase_count, products in conn.execute(sql, params):
+        customers[customer_id] = {
+            "total_spent": round(total_spent, 2),
+            "purchase_count": purchase_count,
+            "products_bought": sorted(products.split(",")) if products else [],
+            "avg_order_value": round(total_spent / purchase_count, 2) if purchase_count > 0 else 0.0
+        }
+
+    return customers
+
+
+def daily_sales_trend_sql(conn, region=None, min_amount=None, max_amount=None):
+    """
+    SQL version of analytics.daily_sales_trend
+    """
+
+    where, params = _where(region, min_amount, max_amount)
+    rows = conn.execute(
+        "SELECT Date, TOTAL(Quantity * UnitPrice), COUNT(*), COUNT(DISTINCT CustomerID)"
+        " FROM transactions" + where + " GROUP BY Date ORDER BY Date",
+        params
+    ).fetchall()
+
+    daily = {}
+    for date, revenue, tx_count, unique_customers in rows:
+        daily[date] = {
+            "revenue": round(revenue, 2),
+            "transaction_count": tx_count,
+            "unique_customers": unique_customers
+        }
+
+    return daily
+
+
+def find_peak_sales_day_sql(conn, region=None, min_amount=None, max_amount=None):
+    trend = daily_sales_trend_sql(conn, region, min_amount, max_amount)
+
+    peak_date = None
+    peak_revenue = -1
+    peak_count = 0
+
+    for date, stats in trend.items():
+        if stats["revenue"] > peak_revenue:
+            peak_revenue = stats["revenue"]
+            peak_date = date
+            peak_count = stats["transaction_count"]
+
+    return (peak_date, peak_revenue, peak_count)
+
+
+def low_performing_products_sql(conn, threshold=10, region=None, min_amount=None, max_amount=None):
+    """
+    SQL version of analytics.low_performing_products
+    """
+
+    where, params = _where(region, min_amount, max_amount)
+    rows = conn.execute(
+        "SELECT ProductName, SUM(Quantity), TOTAL(Quantity * UnitPrice) FROM transactions" + where +
+        " GROUP BY ProductName HAVING SUM(Quantity) < ? ORDER BY 2, MIN(rowid)",
+        params + [threshold]
+    ).fetchall()
+
+    return [(product, qty, round(revenue, 2)) for product, qty, revenue in rows]
+
+
+def sql_report_stats(conn, region=None, min_amount=None, max_amount=None):
+    """
+    Computes every metric the report needs with SQL GROUP BY queries
+    Returns: dict (same shape as report_generator.build_report_stats)
+    """
+
+    filters = (region, min_amount, max_amount)
+    tx_count = count_transactions_sql(conn, *filters)
+
+    return {
+        "records_processed": tx_count,
+        "total_revenue": calculate_total_revenue_sql(conn, *filters),
+        "total_transactions": tx_count,
+        "date_range": date_range_sql(conn, *filters),
+        "region_stats": region_wise_sales_sql(conn, *filters),
+        "top_products": top_selling_products_sql(conn, 5, *filters),
+        "top_customers": list(customer_analysis_sql(conn, 5, *filters).items()),
+        "daily_trend": daily_sales_trend_sql(conn, *filters),
+        "peak_day": find_peak_sales_day_sql(conn, *filters),
+        "low_products": low_performing_products_sql(conn, 10, *filters)
+    }